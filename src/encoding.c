@@ -44,7 +44,6 @@
 struct encoding_map {
 	int		utf8;
 	unsigned char	target;
-	char		*entity;
 };
 
 /**
@@ -52,127 +51,127 @@ struct encoding_map {
  */
 
 static struct encoding_map encoding_acorn_latin1[] = {
-	{160,	'\xa0', "&nbsp;"},	/* No-Break Space				*/
-	{161,	'\xa1',	"&iexcl;"},	/* Inverted Exclamation Mark			*/
-	{162,	'\xa2',	"&cent;"},	/* Cent Sign					*/
-	{163,	'\xa3',	"&pound;"},	/* Pound Sign					*/
-	{164,	'\xa4',	"&curren;"},	/* Currency Sign				*/
-	{165,	'\xa5',	"&yen;"},	/* Yen Sign					*/
-	{166,	'\xa6',	"&brvbar;"},	/* Broken Bar					*/
-	{167,	'\xa7',	"&sect;"},	/* Section Sign					*/
-	{168,	'\xa8',	"&uml;"},	/* Diaeresis					*/
-	{169,	'\xa9',	"&copy;"},	/* Copyright Sign				*/
-	{170,	'\xaa',	"&ordf;"},	/* Feminine Ordinal Indicator			*/
-	{171,	'\xab',	"&laquo;"},	/* Left-Pointing Double Angle Quotation Mark	*/
-	{172,	'\xac',	"&not;"},	/* Not Sign					*/
-	{173,	'\xad',	"&shy;"},	/* Soft Hyphen					*/
-	{174,	'\xae',	"&reg;"},	/* Registered Sign				*/
-	{175,	'\xaf',	"&macr;"},	/* Macron					*/
-	{176,	'\xb0',	"&deg;"},	/* Degree Sign					*/
-	{177,	'\xb1',	"&plusmn;"},	/* Plus-Minus Sign				*/
-	{178,	'\xb2',	"&sup2;"},	/* Superscript Two				*/
-	{179,	'\xb3',	"&sup3;"},	/* Superscript Three				*/
-	{180,	'\xb4',	"&acute;"},	/* Acute Accent					*/
-	{181,	'\xb5',	"&micro;"},	/* Micro Sign					*/
-	{182,	'\xb6',	"&para;"},	/* Pilcrow Sign					*/
-	{183,	'\xb7',	"&middot;"},	/* Middle Dot					*/
-	{184,	'\xb8',	"&cedil;"},	/* Cedilla					*/
-	{185,	'\xb9',	"&sup1;"},	/* Superscript One				*/
-	{186,	'\xba',	"&ordm;"},	/* Masculine Ordinal Indicator			*/
-	{187,	'\xbb',	"&raquo;"},	/* Right-Pointing Double Angle Quotation Mark	*/
-	{188,	'\xbc',	"&frac14;"},	/* Vulgar Fraction One Quarter			*/
-	{189,	'\xbd',	"&frac12;"},	/* Vulgar Fraction One Half			*/
-	{190,	'\xbe',	"&frac34;"},	/* Vulgar Fraction Three Quarters		*/
-	{191,	'\xbf',	"&iquest;"},	/* Inverted Question Mark			*/
-	{192,	'\xc0',	"&Agrave;"},	/* Latin Capital Letter A With Grave		*/
-	{193,	'\xc1',	"&Aacute;"},	/* Latin Capital Letter A With Acute		*/
-	{194,	'\xc2',	"&Acirc;"},	/* Latin Capital Letter A With Circumflex	*/
-	{195,	'\xc3',	"&Atilde;"},	/* Latin Capital Letter A With Tilde		*/
-	{196,	'\xc4',	"&Auml;"},	/* Latin Capital Letter A With Diaeresis	*/
-	{197,	'\xc5',	"&Aring;"},	/* Latin Capital Letter A With Ring Above	*/
-	{198,	'\xc6',	"&AElig;"},	/* Latin Capital Letter AE			*/
-	{199,	'\xc7',	"&Ccedil;"},	/* Latin Capital Letter C With Cedilla		*/
-	{200,	'\xc8',	"&Egrave;"},	/* Latin Capital Letter E With Grave		*/
-	{201,	'\xc9',	"&Eacute;"},	/* Latin Capital Letter E With Acute		*/
-	{202,	'\xca',	"&Ecirc;"},	/* Latin Capital Letter E With Circumflex	*/
-	{203,	'\xcb',	"&Euml;"},	/* Latin Capital Letter E With Diaeresis	*/
-	{204,	'\xcc',	"&Igrave;"},	/* Latin Capital Letter I With Grave		*/
-	{205,	'\xcd',	"&Iacute;"},	/* Latin Capital Letter I With Acute		*/
-	{206,	'\xce',	"&Icirc;"},	/* Latin Capital Letter I With Circumflex	*/
-	{207,	'\xcf',	"&Iuml;"},	/* Latin Capital Letter I With Diaeresis	*/
-	{208,	'\xd0',	"&ETH;"},	/* Latin Capital Letter Eth			*/
-	{209,	'\xd1',	"&Ntilde;"},	/* Latin Capital Letter N With Tilde		*/
-	{210,	'\xd2',	"&Ograve;"},	/* Latin Capital Letter O With Grave		*/
-	{211,	'\xd3',	"&Oacute;"},	/* Latin Capital Letter O With Acute		*/
-	{212,	'\xd4',	"&Ocirc;"},	/* Latin Capital Letter O With Circumflex	*/
-	{213,	'\xd5',	"&Otilde;"},	/* Latin Capital Letter O With Tilde		*/
-	{214,	'\xd6',	"&Ouml;"},	/* Latin Capital Letter O With Diaeresis	*/
-	{215,	'\xd7',	"&times;"},	/* Multiplication Sign				*/
-	{216,	'\xd8',	"&Oslash;"},	/* Latin Capital Letter O With Stroke		*/
-	{217,	'\xd9',	"&Ugrave;"},	/* Latin Capital Letter U With Grave		*/
-	{218,	'\xda',	"&Uacute;"},	/* Latin Capital Letter U With Acute		*/
-	{219,	'\xdb',	"&Ucirc;"},	/* Latin Capital Letter U With Circumflex	*/
-	{220,	'\xdc',	"&Uuml;"},	/* Latin Capital Letter U With Diaeresis	*/
-	{221,	'\xdd',	"&Yacute;"},	/* Latin Capital Letter Y With Acute		*/
-	{222,	'\xde',	"&THORN;"},	/* Latin Capital Letter Thorn			*/
-	{223,	'\xdf',	"&szlig;"},	/* Latin Small Letter Sharp S			*/
-	{224,	'\xe0',	"&agrave;"},	/* Latin Small Letter A With Grave		*/
-	{225,	'\xe1',	"&aacute;"},	/* Latin Small Letter A With Acute		*/
-	{226,	'\xe2',	"&acirc;"},	/* Latin Small Letter A With Circumflex		*/
-	{227,	'\xe3',	"&atilde;"},	/* Latin Small Letter A With Tilde		*/
-	{228,	'\xe4',	"&auml;"},	/* Latin Small Letter A With Diaeresis		*/
-	{229,	'\xe5',	"&aring;"},	/* Latin Small Letter A With Ring Above		*/
-	{230,	'\xe6',	"&aelig;"},	/* Latin Small Letter AE			*/
-	{231,	'\xe7',	"&ccedil;"},	/* Latin Small Letter C With Cedilla		*/
-	{232,	'\xe8',	"&egrave;"},	/* Latin Small Letter E With Grave		*/
-	{233,	'\xe9',	"&eacute;"},	/* Latin Small Letter E With Acute		*/
-	{234,	'\xea',	"&ecirc;"},	/* Latin Small Letter E With Circumflex		*/
-	{235,	'\xeb',	"&euml;"},	/* Latin Small Letter E With Diaeresis		*/
-	{236,	'\xec',	"&igrave;"},	/* Latin Small Letter I With Grave		*/
-	{237,	'\xed',	"&iacute;"},	/* Latin Small Letter I With Acute		*/
-	{238,	'\xee',	"&icirc;"},	/* Latin Small Letter I With Circumflex		*/
-	{239,	'\xef',	"&iuml;"},	/* Latin Small Letter I With Diaeresis		*/
-	{240,	'\xf0',	"&eth;"},	/* Latin Small Letter Eth			*/
-	{241,	'\xf1',	"&ntilde;"},	/* Latin Small Letter N With Tilde		*/
-	{242,	'\xf2',	"&ograve;"},	/* Latin Small Letter O With Grave		*/
-	{243,	'\xf3',	"&oacute;"},	/* Latin Small Letter O With Acute		*/
-	{244,	'\xf4',	"&ocirc;"},	/* Latin Small Letter O With Circumflex		*/
-	{245,	'\xf5',	"&otilde;"},	/* Latin Small Letter O With Tilde		*/
-	{246,	'\xf6',	"&ouml;"},	/* Latin Small Letter O With Diaeresis		*/
-	{247,	'\xf7',	"&divide;"},	/* Division Sign				*/
-	{248,	'\xf8',	"&oslash;"},	/* Latin Small Letter O With Stroke		*/
-	{249,	'\xf9',	"&ugrave;"},	/* Latin Small Letter U With Grave		*/
-	{250,	'\xfa',	"&uacute;"},	/* Latin Small Letter U With Acute		*/
-	{251,	'\xfb',	"&ucirc;"},	/* Latin Small Letter U With Circumflex		*/
-	{252,	'\xfc',	"&uuml;"},	/* Latin Small Letter U With Diaeresis		*/
-	{253,	'\xfd',	"&yacute;"},	/* Latin Small Letter Y With Acute		*/
-	{254,	'\xfe',	"&thorn;"},	/* Latin Small Letter Thorn			*/
-	{255,	'\xff',	"&yuml;"},	/* Latin Small Letter Y With Diaeresis		*/
-	{338,	'\x9a',	"&OElig;"},	/* Latin Capital Ligature OE			*/
-	{339,	'\x9b',	"&oelig;"},	/* Latin Small Ligature OE			*/
-	{372,	'\x81',	"&Wcirc;"},	/* Latin Capital Letter W With Circumflex	*/
-	{373,	'\x82',	"&wcirc;"},	/* Latin Small Letter W With Circumflex		*/
-	{374,	'\x85',	"&Ycirc;"},	/* Latin Capital Letter Y With Circumflex	*/
-	{375,	'\x86',	"&ycirc;"},	/* Latin Small Letter Y With Circumflex		*/
-	{8211,	'\x97',	"&ndash;"},	/* En Dash					*/
-	{8212,	'\x98',	"&mdash;"},	/* Em Dash					*/
-	{8216,	'\x90',	"&lsquo;"},	/* Left Single Quotation Mark			*/
-	{8217,	'\x91',	"&rsquo;"},	/* Right Single Quotation Mark			*/
-	{8220,	'\x94',	"&ldquo;"},	/* Left Double Quotation Mark			*/
-	{8221,	'\x95',	"&rdquo;"},	/* Right Double Quotation Mark			*/
-	{8222,	'\x96',	"&bdquo;"},	/* Double Low-9 Quotation Mark			*/
-	{8224,	'\x9c',	"&dagger;"},	/* Dagger					*/
-	{8225,	'\x9d',	"&Dagger;"},	/* Double Dagger				*/
-	{8226,	'\x8f',	"&bull;"},	/* Bullet					*/
-	{8230,	'\x8c',	"&hellip;"},	/* Horizontal Ellipsis				*/
-	{8240,	'\x8e',	"&permil;"},	/* Per Mille Sign				*/
-	{8249,	'\x92',	"&lsaquo;"},	/* Single Left-Pointing Angle Quotation Mark	*/
-	{8250,	'\x93',	"&rsaquo;"},	/* Single Right-Pointing Angle Quotation Mark	*/
-	{8482,	'\x8d',	"&trade;"},	/* Trade Mark Sign				*/
-	{8722,	'\x99',	"&minus;"},	/* Minus Sign					*/
-	{64257,	'\x9e',	"&filig;"},	/* Latin Small Ligature Fi			*/
-	{64258,	'\x9f',	"&fllig;"},	/* Latin Small Ligature Fl			*/
-	{0,	'\0',	NULL}		/* End of Table					*/
+	{160,	'\xa0'},	/* No-Break Space				*/
+	{161,	'\xa1'},	/* Inverted Exclamation Mark			*/
+	{162,	'\xa2'},	/* Cent Sign					*/
+	{163,	'\xa3'},	/* Pound Sign					*/
+	{164,	'\xa4'},	/* Currency Sign				*/
+	{165,	'\xa5'},	/* Yen Sign					*/
+	{166,	'\xa6'},	/* Broken Bar					*/
+	{167,	'\xa7'},	/* Section Sign					*/
+	{168,	'\xa8'},	/* Diaeresis					*/
+	{169,	'\xa9'},	/* Copyright Sign				*/
+	{170,	'\xaa'},	/* Feminine Ordinal Indicator			*/
+	{171,	'\xab'},	/* Left-Pointing Double Angle Quotation Mark	*/
+	{172,	'\xac'},	/* Not Sign					*/
+	{173,	'\xad'},	/* Soft Hyphen					*/
+	{174,	'\xae'},	/* Registered Sign				*/
+	{175,	'\xaf'},	/* Macron					*/
+	{176,	'\xb0'},	/* Degree Sign					*/
+	{177,	'\xb1'},	/* Plus-Minus Sign				*/
+	{178,	'\xb2'},	/* Superscript Two				*/
+	{179,	'\xb3'},	/* Superscript Three				*/
+	{180,	'\xb4'},	/* Acute Accent					*/
+	{181,	'\xb5'},	/* Micro Sign					*/
+	{182,	'\xb6'},	/* Pilcrow Sign					*/
+	{183,	'\xb7'},	/* Middle Dot					*/
+	{184,	'\xb8'},	/* Cedilla					*/
+	{185,	'\xb9'},	/* Superscript One				*/
+	{186,	'\xba'},	/* Masculine Ordinal Indicator			*/
+	{187,	'\xbb'},	/* Right-Pointing Double Angle Quotation Mark	*/
+	{188,	'\xbc'},	/* Vulgar Fraction One Quarter			*/
+	{189,	'\xbd'},	/* Vulgar Fraction One Half			*/
+	{190,	'\xbe'},	/* Vulgar Fraction Three Quarters		*/
+	{191,	'\xbf'},	/* Inverted Question Mark			*/
+	{192,	'\xc0'},	/* Latin Capital Letter A With Grave		*/
+	{193,	'\xc1'},	/* Latin Capital Letter A With Acute		*/
+	{194,	'\xc2'},	/* Latin Capital Letter A With Circumflex	*/
+	{195,	'\xc3'},	/* Latin Capital Letter A With Tilde		*/
+	{196,	'\xc4'},	/* Latin Capital Letter A With Diaeresis	*/
+	{197,	'\xc5'},	/* Latin Capital Letter A With Ring Above	*/
+	{198,	'\xc6'},	/* Latin Capital Letter AE			*/
+	{199,	'\xc7'},	/* Latin Capital Letter C With Cedilla		*/
+	{200,	'\xc8'},	/* Latin Capital Letter E With Grave		*/
+	{201,	'\xc9'},	/* Latin Capital Letter E With Acute		*/
+	{202,	'\xca'},	/* Latin Capital Letter E With Circumflex	*/
+	{203,	'\xcb'},	/* Latin Capital Letter E With Diaeresis	*/
+	{204,	'\xcc'},	/* Latin Capital Letter I With Grave		*/
+	{205,	'\xcd'},	/* Latin Capital Letter I With Acute		*/
+	{206,	'\xce'},	/* Latin Capital Letter I With Circumflex	*/
+	{207,	'\xcf'},	/* Latin Capital Letter I With Diaeresis	*/
+	{208,	'\xd0'},	/* Latin Capital Letter Eth			*/
+	{209,	'\xd1'},	/* Latin Capital Letter N With Tilde		*/
+	{210,	'\xd2'},	/* Latin Capital Letter O With Grave		*/
+	{211,	'\xd3'},	/* Latin Capital Letter O With Acute		*/
+	{212,	'\xd4'},	/* Latin Capital Letter O With Circumflex	*/
+	{213,	'\xd5'},	/* Latin Capital Letter O With Tilde		*/
+	{214,	'\xd6'},	/* Latin Capital Letter O With Diaeresis	*/
+	{215,	'\xd7'},	/* Multiplication Sign				*/
+	{216,	'\xd8'},	/* Latin Capital Letter O With Stroke		*/
+	{217,	'\xd9'},	/* Latin Capital Letter U With Grave		*/
+	{218,	'\xda'},	/* Latin Capital Letter U With Acute		*/
+	{219,	'\xdb'},	/* Latin Capital Letter U With Circumflex	*/
+	{220,	'\xdc'},	/* Latin Capital Letter U With Diaeresis	*/
+	{221,	'\xdd'},	/* Latin Capital Letter Y With Acute		*/
+	{222,	'\xde'},	/* Latin Capital Letter Thorn			*/
+	{223,	'\xdf'},	/* Latin Small Letter Sharp S			*/
+	{224,	'\xe0'},	/* Latin Small Letter A With Grave		*/
+	{225,	'\xe1'},	/* Latin Small Letter A With Acute		*/
+	{226,	'\xe2'},	/* Latin Small Letter A With Circumflex		*/
+	{227,	'\xe3'},	/* Latin Small Letter A With Tilde		*/
+	{228,	'\xe4'},	/* Latin Small Letter A With Diaeresis		*/
+	{229,	'\xe5'},	/* Latin Small Letter A With Ring Above		*/
+	{230,	'\xe6'},	/* Latin Small Letter AE			*/
+	{231,	'\xe7'},	/* Latin Small Letter C With Cedilla		*/
+	{232,	'\xe8'},	/* Latin Small Letter E With Grave		*/
+	{233,	'\xe9'},	/* Latin Small Letter E With Acute		*/
+	{234,	'\xea'},	/* Latin Small Letter E With Circumflex		*/
+	{235,	'\xeb'},	/* Latin Small Letter E With Diaeresis		*/
+	{236,	'\xec'},	/* Latin Small Letter I With Grave		*/
+	{237,	'\xed'},	/* Latin Small Letter I With Acute		*/
+	{238,	'\xee'},	/* Latin Small Letter I With Circumflex		*/
+	{239,	'\xef'},	/* Latin Small Letter I With Diaeresis		*/
+	{240,	'\xf0'},	/* Latin Small Letter Eth			*/
+	{241,	'\xf1'},	/* Latin Small Letter N With Tilde		*/
+	{242,	'\xf2'},	/* Latin Small Letter O With Grave		*/
+	{243,	'\xf3'},	/* Latin Small Letter O With Acute		*/
+	{244,	'\xf4'},	/* Latin Small Letter O With Circumflex		*/
+	{245,	'\xf5'},	/* Latin Small Letter O With Tilde		*/
+	{246,	'\xf6'},	/* Latin Small Letter O With Diaeresis		*/
+	{247,	'\xf7'},	/* Division Sign				*/
+	{248,	'\xf8'},	/* Latin Small Letter O With Stroke		*/
+	{249,	'\xf9'},	/* Latin Small Letter U With Grave		*/
+	{250,	'\xfa'},	/* Latin Small Letter U With Acute		*/
+	{251,	'\xfb'},	/* Latin Small Letter U With Circumflex		*/
+	{252,	'\xfc'},	/* Latin Small Letter U With Diaeresis		*/
+	{253,	'\xfd'},	/* Latin Small Letter Y With Acute		*/
+	{254,	'\xfe'},	/* Latin Small Letter Thorn			*/
+	{255,	'\xff'},	/* Latin Small Letter Y With Diaeresis		*/
+	{338,	'\x9a'},	/* Latin Capital Ligature OE			*/
+	{339,	'\x9b'},	/* Latin Small Ligature OE			*/
+	{372,	'\x81'},	/* Latin Capital Letter W With Circumflex	*/
+	{373,	'\x82'},	/* Latin Small Letter W With Circumflex		*/
+	{374,	'\x85'},	/* Latin Capital Letter Y With Circumflex	*/
+	{375,	'\x86'},	/* Latin Small Letter Y With Circumflex		*/
+	{8211,	'\x97'},	/* En Dash					*/
+	{8212,	'\x98'},	/* Em Dash					*/
+	{8216,	'\x90'},	/* Left Single Quotation Mark			*/
+	{8217,	'\x91'},	/* Right Single Quotation Mark			*/
+	{8220,	'\x94'},	/* Left Double Quotation Mark			*/
+	{8221,	'\x95'},	/* Right Double Quotation Mark			*/
+	{8222,	'\x96'},	/* Double Low-9 Quotation Mark			*/
+	{8224,	'\x9c'},	/* Dagger					*/
+	{8225,	'\x9d'},	/* Double Dagger				*/
+	{8226,	'\x8f'},	/* Bullet					*/
+	{8230,	'\x8c'},	/* Horizontal Ellipsis				*/
+	{8240,	'\x8e'},	/* Per Mille Sign				*/
+	{8249,	'\x92'},	/* Single Left-Pointing Angle Quotation Mark	*/
+	{8250,	'\x93'},	/* Single Right-Pointing Angle Quotation Mark	*/
+	{8482,	'\x8d'},	/* Trade Mark Sign				*/
+	{8722,	'\x99'},	/* Minus Sign					*/
+	{64257,	'\x9e'},	/* Latin Small Ligature Fi			*/
+	{64258,	'\x9f'},	/* Latin Small Ligature Fl			*/
+	{0,	'\0'}		/* End of Table					*/
 };
 
 /**
@@ -180,123 +179,123 @@ static struct encoding_map encoding_acorn_latin1[] = {
  */
 
 static struct encoding_map encoding_acorn_latin2[] = {
-	{160,	'\xa0', "&nbsp;"},	/* No-Break Space				*/
-	{164,	'\xa4',	"&curren;"},	/* Currency Sign				*/
-	{167,	'\xa7',	"&sect;"},	/* Section Sign					*/
-	{168,	'\xa8',	"&uml;"},	/* Diaeresis					*/
-	{173,	'\xad',	"&shy;"},	/* Soft Hyphen					*/
-	{176,	'\xb0',	"&deg;"},	/* Degree Sign					*/
-	{180,	'\xb4',	"&acute;"},	/* Acute Accent					*/
-	{184,	'\xb8',	"&cedil;"},	/* Cedilla					*/
-	{193,	'\xc1',	"&Aacute;"},	/* Latin Capital Letter A With Acute		*/
-	{194,	'\xc2',	"&Acirc;"},	/* Latin Capital Letter A With Circumflex	*/
-	{196,	'\xc4',	"&Auml;"},	/* Latin Capital Letter A With Diaeresis	*/
-	{199,	'\xc7',	"&Ccedil;"},	/* Latin Capital Letter C With Cedilla		*/
-	{201,	'\xc9',	"&Eacute;"},	/* Latin Capital Letter E With Acute		*/
-	{203,	'\xcb',	"&Euml;"},	/* Latin Capital Letter E With Diaeresis	*/
-	{205,	'\xcd',	"&Iacute;"},	/* Latin Capital Letter I With Acute		*/
-	{206,	'\xce',	"&Icirc;"},	/* Latin Capital Letter I With Circumflex	*/
-	{211,	'\xd3',	"&Oacute;"},	/* Latin Capital Letter O With Acute		*/
-	{212,	'\xd4',	"&Ocirc;"},	/* Latin Capital Letter O With Circumflex	*/
-	{214,	'\xd6',	"&Ouml;"},	/* Latin Capital Letter O With Diaeresis	*/
-	{215,	'\xd7',	"&times;"},	/* Multiplication Sign				*/
-	{218,	'\xda',	"&Uacute;"},	/* Latin Capital Letter U With Acute		*/
-	{220,	'\xdc',	"&Uuml;"},	/* Latin Capital Letter U With Diaeresis	*/
-	{221,	'\xdd',	"&Yacute;"},	/* Latin Capital Letter Y With Acute		*/
-	{223,	'\xdf',	"&szlig;"},	/* Latin Small Letter Sharp S			*/
-	{225,	'\xe1',	"&aacute;"},	/* Latin Small Letter A With Acute		*/
-	{226,	'\xe2',	"&acirc;"},	/* Latin Small Letter A With Circumflex		*/
-	{228,	'\xe4',	"&auml;"},	/* Latin Small Letter A With Diaeresis		*/
-	{231,	'\xe7',	"&ccedil;"},	/* Latin Small Letter C With Cedilla		*/
-	{233,	'\xe9',	"&eacute;"},	/* Latin Small Letter E With Acute		*/
-	{235,	'\xeb',	"&euml;"},	/* Latin Small Letter E With Diaeresis		*/
-	{237,	'\xed',	"&iacute;"},	/* Latin Small Letter I With Acute		*/
-	{238,	'\xee',	"&icirc;"},	/* Latin Small Letter I With Circumflex		*/
-	{243,	'\xf3',	"&oacute;"},	/* Latin Small Letter O With Acute		*/
-	{244,	'\xf4',	"&ocirc;"},	/* Latin Small Letter O With Circumflex		*/
-	{246,	'\xf6',	"&ouml;"},	/* Latin Small Letter O With Diaeresis		*/
-	{247,	'\xf7',	"&divide;"},	/* Division Sign				*/
-	{250,	'\xfa',	"&uacute;"},	/* Latin Small Letter U With Acute		*/
-	{252,	'\xfc',	"&uuml;"},	/* Latin Small Letter U With Diaeresis		*/
-	{253,	'\xfd',	"&yacute;"},	/* Latin Small Letter Y With Acute		*/
-	{258,	'\xc3',	"&Abreve;"},	/* Latin Capital Letter A With Breve		*/
-	{259,	'\xe3',	"&abreve;"},	/* Latin Small Letter A With Breve		*/
-	{260,	'\xa1',	"&Aogon;"},	/* Latin Capital Letter A With Ogonek		*/
-	{261,	'\xb1',	"&aogon;"},	/* Latin Small Letter A With Ogonek		*/
-	{262,	'\xc6',	"&Cacute;"},	/* Latin Capital Letter C With Acute		*/
-	{263,	'\xe6',	"&cacute;"},	/* Latin Small Letter C With Acute		*/
-	{268,	'\xc8',	"&Ccaron;"},	/* Latin Capital Letter C With Caron		*/
-	{269,	'\xe8',	"&ccaron;"},	/* Latin Small Letter C With Caron		*/
-	{270,	'\xcf',	"&Dcaron;"},	/* Latin Capital Letter D With Caron		*/
-	{271,	'\xef',	"&dcaron;"},	/* Latin Small Letter D With Caron		*/
-	{272,	'\xd0',	"&Dstrok;"},	/* Latin Capital Letter D With Stroke		*/
-	{273,	'\xf0',	"&dstrok;"},	/* Latin Small Letter D With Stroke		*/
-	{280,	'\xca',	"&Eogon;"},	/* Latin Capital Letter E With Ogonek		*/
-	{281,	'\xea',	"&eogon;"},	/* Latin Small Letter E With Ogonek		*/
-	{282,	'\xcc',	"&Ecaron;"},	/* Latin Capital Letter E With Caron		*/
-	{283,	'\xec',	"&ecaron;"},	/* Latin Small Letter E With Caron		*/
-	{313,	'\xc5',	"&Lacute;"},	/* Latin Capital Letter L With Acute		*/
-	{314,	'\xe5',	"&lacute;"},	/* Latin Small Letter L With Acute		*/
-	{317,	'\xa5',	"&Lcaron;"},	/* Latin Capital Letter L With Caron		*/
-	{318,	'\xb5',	"&lcaron;"},	/* Latin Small Letter L With Caron		*/
-	{321,	'\xa3',	"&Lstrok;"},	/* Latin Capital Letter L With Stroke		*/
-	{322,	'\xb3',	"&lstrok;"},	/* Latin Small Letter L With Stroke		*/
-	{323,	'\xd1',	"&Nacute;"},	/* Latin Capital Letter N With Acute		*/
-	{324,	'\xf1',	"&nacute;"},	/* Latin Small Letter N With Acute		*/
-	{327,	'\xd2',	"&Ncaron;"},	/* Latin Capital Letter N With Caron		*/
-	{328,	'\xf2',	"&ncaron;"},	/* Latin Small Letter N With Caron		*/
-	{336,	'\xd5',	"&Odblac;"},	/* Latin Capital Letter O With Double Acute	*/
-	{337,	'\xf5',	"&odblac;"},	/* Latin Small Letter O With Double Acute	*/
-	{338,	'\x9a',	"&OElig;"},	/* Latin Capital Ligature OE			*/
-	{339,	'\x9b',	"&oelig;"},	/* Latin Small Ligature OE			*/
-	{340,	'\xc0',	"&Racute;"},	/* Latin Capital Letter R With Acute		*/
-	{341,	'\xe0',	"&racute;"},	/* Latin Small Letter R With Acute		*/
-	{344,	'\xd8',	"&Rcaron;"},	/* Latin Capital Letter R With Caron		*/
-	{345,	'\xf8',	"&rcaron;"},	/* Latin Small Letter R With Caron		*/
-	{346,	'\xa6',	"&Sacute;"},	/* Latin Capital Letter S With Acute		*/
-	{347,	'\xb6',	"&sacute;"},	/* Latin Small Letter S With Acute		*/
-	{350,	'\xaa',	"&Scedil;"},	/* Latin Capital Letter S With Cedilla		*/
-	{351,	'\xba',	"&scedil;"},	/* Latin Small Letter S With Cedilla		*/
-	{352,	'\xa9',	"&Scaron;"},	/* Latin Capital Letter S With Caron		*/
-	{353,	'\xb9',	"&scaron;"},	/* Latin Small Letter S With Caron		*/
-	{354,	'\xde',	"&Tcedil;"},	/* Latin Capital Letter T With Cedilla		*/
-	{355,	'\xfe',	"&tcedil;"},	/* Latin Small Letter T With Cedilla		*/
-	{356,	'\xab',	"&Tcaron;"},	/* Latin Capital Letter T With Caron		*/
-	{357,	'\xbb',	"&tcaron;"},	/* Latin Small Letter T With Caron		*/
-	{366,	'\xd9',	"&Uring;"},	/* Latin Capital Letter U With Ring Above	*/
-	{367,	'\xf9',	"&uring;"},	/* Latin Small Letter U With Ring Above		*/
-	{368,	'\xdb',	"&Udblac;"},	/* Latin Capital Letter U With Double Acute	*/
-	{369,	'\xfb',	"&udblac;"},	/* Latin Small Letter U With Double Acute	*/
-	{377,	'\xac',	"&Zacute;"},	/* Latin Capital Letter Z With Acute		*/
-	{378,	'\xbc',	"&zacute;"},	/* Latin Small Letter Z With Acute		*/
-	{379,	'\xaf',	"&Zdot;"},	/* Latin Capital Letter Z With Dot Above	*/
-	{380,	'\xbf',	"&zdot;"},	/* Latin Small Letter Z With Dot Above		*/
-	{381,	'\xae',	"&Zcaron;"},	/* Latin Capital Letter Z With Caron		*/
-	{382,	'\xbe',	"&zcaron;"},	/* Latin Small Letter Z With Caron		*/
-	{774,	'\xa2',	NULL},		/* Breve					*/
-	{775,	'\xff',	NULL},	 	/* Dot Above					*/
-	{779,	'\xbd', NULL},		/* Double Acute Accent				*/
-	{780,	'\xb7',	NULL},		/* Caron					*/
-	{808,	'\xb2',	NULL},		/* Ogonek					*/
-	{8211,	'\x97',	"&ndash;"},	/* En Dash					*/
-	{8212,	'\x98',	"&mdash;"},	/* Em Dash					*/
-	{8216,	'\x90',	"&lsquo;"},	/* Left Single Quotation Mark			*/
-	{8217,	'\x91',	"&rsquo;"},	/* Right Single Quotation Mark			*/
-	{8220,	'\x94',	"&ldquo;"},	/* Left Double Quotation Mark			*/
-	{8221,	'\x95',	"&rdquo;"},	/* Right Double Quotation Mark			*/
-	{8222,	'\x96',	"&bdquo;"},	/* Double Low-9 Quotation Mark			*/
-	{8224,	'\x9c',	"&dagger;"},	/* Dagger					*/
-	{8225,	'\x9d',	"&Dagger;"},	/* Double Dagger				*/
-	{8226,	'\x8f',	"&bull;"},	/* Bullet					*/
-	{8230,	'\x8c',	"&hellip;"},	/* Horizontal Ellipsis				*/
-	{8240,	'\x8e',	"&permil;"},	/* Per Mille Sign				*/
-	{8249,	'\x92',	"&lsaquo;"},	/* Single Left-Pointing Angle Quotation Mark	*/
-	{8250,	'\x93',	"&rsaquo;"},	/* Single Right-Pointing Angle Quotation Mark	*/
-	{8482,	'\x8d',	"&trade;"},	/* Trade Mark Sign				*/
-	{8722,	'\x99',	"&minus;"},	/* Minus Sign					*/
-	{64257,	'\x9e',	"&filig;"},	/* Latin Small Ligature Fi			*/
-	{64258,	'\x9f',	"&fllig;"},	/* Latin Small Ligature Fl			*/
-	{0,	'\0',	NULL}		/* End of Table					*/
+	{160,	'\xa0'},	/* No-Break Space				*/
+	{164,	'\xa4'},	/* Currency Sign				*/
+	{167,	'\xa7'},	/* Section Sign					*/
+	{168,	'\xa8'},	/* Diaeresis					*/
+	{173,	'\xad'},	/* Soft Hyphen					*/
+	{176,	'\xb0'},	/* Degree Sign					*/
+	{180,	'\xb4'},	/* Acute Accent					*/
+	{184,	'\xb8'},	/* Cedilla					*/
+	{193,	'\xc1'},	/* Latin Capital Letter A With Acute		*/
+	{194,	'\xc2'},	/* Latin Capital Letter A With Circumflex	*/
+	{196,	'\xc4'},	/* Latin Capital Letter A With Diaeresis	*/
+	{199,	'\xc7'},	/* Latin Capital Letter C With Cedilla		*/
+	{201,	'\xc9'},	/* Latin Capital Letter E With Acute		*/
+	{203,	'\xcb'},	/* Latin Capital Letter E With Diaeresis	*/
+	{205,	'\xcd'},	/* Latin Capital Letter I With Acute		*/
+	{206,	'\xce'},	/* Latin Capital Letter I With Circumflex	*/
+	{211,	'\xd3'},	/* Latin Capital Letter O With Acute		*/
+	{212,	'\xd4'},	/* Latin Capital Letter O With Circumflex	*/
+	{214,	'\xd6'},	/* Latin Capital Letter O With Diaeresis	*/
+	{215,	'\xd7'},	/* Multiplication Sign				*/
+	{218,	'\xda'},	/* Latin Capital Letter U With Acute		*/
+	{220,	'\xdc'},	/* Latin Capital Letter U With Diaeresis	*/
+	{221,	'\xdd'},	/* Latin Capital Letter Y With Acute		*/
+	{223,	'\xdf'},	/* Latin Small Letter Sharp S			*/
+	{225,	'\xe1'},	/* Latin Small Letter A With Acute		*/
+	{226,	'\xe2'},	/* Latin Small Letter A With Circumflex		*/
+	{228,	'\xe4'},	/* Latin Small Letter A With Diaeresis		*/
+	{231,	'\xe7'},	/* Latin Small Letter C With Cedilla		*/
+	{233,	'\xe9'},	/* Latin Small Letter E With Acute		*/
+	{235,	'\xeb'},	/* Latin Small Letter E With Diaeresis		*/
+	{237,	'\xed'},	/* Latin Small Letter I With Acute		*/
+	{238,	'\xee'},	/* Latin Small Letter I With Circumflex		*/
+	{243,	'\xf3'},	/* Latin Small Letter O With Acute		*/
+	{244,	'\xf4'},	/* Latin Small Letter O With Circumflex		*/
+	{246,	'\xf6'},	/* Latin Small Letter O With Diaeresis		*/
+	{247,	'\xf7'},	/* Division Sign				*/
+	{250,	'\xfa'},	/* Latin Small Letter U With Acute		*/
+	{252,	'\xfc'},	/* Latin Small Letter U With Diaeresis		*/
+	{253,	'\xfd'},	/* Latin Small Letter Y With Acute		*/
+	{258,	'\xc3'},	/* Latin Capital Letter A With Breve		*/
+	{259,	'\xe3'},	/* Latin Small Letter A With Breve		*/
+	{260,	'\xa1'},	/* Latin Capital Letter A With Ogonek		*/
+	{261,	'\xb1'},	/* Latin Small Letter A With Ogonek		*/
+	{262,	'\xc6'},	/* Latin Capital Letter C With Acute		*/
+	{263,	'\xe6'},	/* Latin Small Letter C With Acute		*/
+	{268,	'\xc8'},	/* Latin Capital Letter C With Caron		*/
+	{269,	'\xe8'},	/* Latin Small Letter C With Caron		*/
+	{270,	'\xcf'},	/* Latin Capital Letter D With Caron		*/
+	{271,	'\xef'},	/* Latin Small Letter D With Caron		*/
+	{272,	'\xd0'},	/* Latin Capital Letter D With Stroke		*/
+	{273,	'\xf0'},	/* Latin Small Letter D With Stroke		*/
+	{280,	'\xca'},	/* Latin Capital Letter E With Ogonek		*/
+	{281,	'\xea'},	/* Latin Small Letter E With Ogonek		*/
+	{282,	'\xcc'},	/* Latin Capital Letter E With Caron		*/
+	{283,	'\xec'},	/* Latin Small Letter E With Caron		*/
+	{313,	'\xc5'},	/* Latin Capital Letter L With Acute		*/
+	{314,	'\xe5'},	/* Latin Small Letter L With Acute		*/
+	{317,	'\xa5'},	/* Latin Capital Letter L With Caron		*/
+	{318,	'\xb5'},	/* Latin Small Letter L With Caron		*/
+	{321,	'\xa3'},	/* Latin Capital Letter L With Stroke		*/
+	{322,	'\xb3'},	/* Latin Small Letter L With Stroke		*/
+	{323,	'\xd1'},	/* Latin Capital Letter N With Acute		*/
+	{324,	'\xf1'},	/* Latin Small Letter N With Acute		*/
+	{327,	'\xd2'},	/* Latin Capital Letter N With Caron		*/
+	{328,	'\xf2'},	/* Latin Small Letter N With Caron		*/
+	{336,	'\xd5'},	/* Latin Capital Letter O With Double Acute	*/
+	{337,	'\xf5'},	/* Latin Small Letter O With Double Acute	*/
+	{338,	'\x9a'},	/* Latin Capital Ligature OE			*/
+	{339,	'\x9b'},	/* Latin Small Ligature OE			*/
+	{340,	'\xc0'},	/* Latin Capital Letter R With Acute		*/
+	{341,	'\xe0'},	/* Latin Small Letter R With Acute		*/
+	{344,	'\xd8'},	/* Latin Capital Letter R With Caron		*/
+	{345,	'\xf8'},	/* Latin Small Letter R With Caron		*/
+	{346,	'\xa6'},	/* Latin Capital Letter S With Acute		*/
+	{347,	'\xb6'},	/* Latin Small Letter S With Acute		*/
+	{350,	'\xaa'},	/* Latin Capital Letter S With Cedilla		*/
+	{351,	'\xba'},	/* Latin Small Letter S With Cedilla		*/
+	{352,	'\xa9'},	/* Latin Capital Letter S With Caron		*/
+	{353,	'\xb9'},	/* Latin Small Letter S With Caron		*/
+	{354,	'\xde'},	/* Latin Capital Letter T With Cedilla		*/
+	{355,	'\xfe'},	/* Latin Small Letter T With Cedilla		*/
+	{356,	'\xab'},	/* Latin Capital Letter T With Caron		*/
+	{357,	'\xbb'},	/* Latin Small Letter T With Caron		*/
+	{366,	'\xd9'},	/* Latin Capital Letter U With Ring Above	*/
+	{367,	'\xf9'},	/* Latin Small Letter U With Ring Above		*/
+	{368,	'\xdb'},	/* Latin Capital Letter U With Double Acute	*/
+	{369,	'\xfb'},	/* Latin Small Letter U With Double Acute	*/
+	{377,	'\xac'},	/* Latin Capital Letter Z With Acute		*/
+	{378,	'\xbc'},	/* Latin Small Letter Z With Acute		*/
+	{379,	'\xaf'},	/* Latin Capital Letter Z With Dot Above	*/
+	{380,	'\xbf'},	/* Latin Small Letter Z With Dot Above		*/
+	{381,	'\xae'},	/* Latin Capital Letter Z With Caron		*/
+	{382,	'\xbe'},	/* Latin Small Letter Z With Caron		*/
+	{774,	'\xa2'},	/* Breve					*/
+	{775,	'\xff'},	/* Dot Above					*/
+	{779,	'\xbd'},	/* Double Acute Accent				*/
+	{780,	'\xb7'},	/* Caron					*/
+	{808,	'\xb2'},	/* Ogonek					*/
+	{8211,	'\x97'},	/* En Dash					*/
+	{8212,	'\x98'},	/* Em Dash					*/
+	{8216,	'\x90'},	/* Left Single Quotation Mark			*/
+	{8217,	'\x91'},	/* Right Single Quotation Mark			*/
+	{8220,	'\x94'},	/* Left Double Quotation Mark			*/
+	{8221,	'\x95'},	/* Right Double Quotation Mark			*/
+	{8222,	'\x96'},	/* Double Low-9 Quotation Mark			*/
+	{8224,	'\x9c'},	/* Dagger					*/
+	{8225,	'\x9d'},	/* Double Dagger				*/
+	{8226,	'\x8f'},	/* Bullet					*/
+	{8230,	'\x8c'},	/* Horizontal Ellipsis				*/
+	{8240,	'\x8e'},	/* Per Mille Sign				*/
+	{8249,	'\x92'},	/* Single Left-Pointing Angle Quotation Mark	*/
+	{8250,	'\x93'},	/* Single Right-Pointing Angle Quotation Mark	*/
+	{8482,	'\x8d'},	/* Trade Mark Sign				*/
+	{8722,	'\x99'},	/* Minus Sign					*/
+	{64257,	'\x9e'},	/* Latin Small Ligature Fi			*/
+	{64258,	'\x9f'},	/* Latin Small Ligature Fl			*/
+	{0,	'\0'}		/* End of Table					*/
 };
 
 /**
@@ -360,6 +359,35 @@ static struct encoding_map *encoding_current_map = NULL;
 
 static size_t encoding_current_map_size = 0;
 
+/**
+ * The number of Unicode code points covered by each block in the second
+ * stage of the encoding lookup table.
+ */
+
+#define ENCODING_LOOKUP_BLOCK_SIZE 256
+
+/**
+ * The number of first stage entries required to cover the whole Unicode
+ * range, from U+0000 to U+10FFFF.
+ */
+
+#define ENCODING_LOOKUP_INDEX_SIZE (0x110000 / ENCODING_LOOKUP_BLOCK_SIZE)
+
+/**
+ * The first stage of the encoding lookup table: for each block of code
+ * points, the number of the second stage block holding its mappings. Block
+ * zero is always empty, and is shared by all unmapped blocks.
+ */
+
+static unsigned short encoding_lookup_index[ENCODING_LOOKUP_INDEX_SIZE];
+
+/**
+ * The second stage of the encoding lookup table: the target character for
+ * each code point, or zero if it is not mapped. NULL if there is no table.
+ */
+
+static unsigned char *encoding_lookup_blocks = NULL;
+
 /**
  * The current line end selection.
  */
@@ -368,6 +396,7 @@ static int encoding_current_line_end = -1;
 
 /* Static Function Prototypes. */
 
+static bool encoding_build_lookup(void);
 static bool encoding_find_mapped_character(int unicode, char *c);
 
 /**
@@ -406,6 +435,9 @@ bool encoding_select_table(enum encoding_target target)
 	encoding_current_map = NULL;
 	encoding_current_map_size = 0;
 
+	free(encoding_lookup_blocks);
+	encoding_lookup_blocks = NULL;
+
 	/* Check that the requested map actually exists. */
 
 	if (target < 0 || target >= ENCODING_TARGET_MAX)
@@ -460,6 +492,56 @@ bool encoding_select_table(enum encoding_target target)
 			msg_report(MSG_ENC_NO_MAP, i, i);
 	}
 
+	return encoding_build_lookup();
+}
+
+/**
+ * Build the two-stage lookup table for the current encoding map, so that
+ * characters can be mapped without searching the table.
+ *
+ * \return			True if successful; False on failure.
+ */
+
+static bool encoding_build_lookup(void)
+{
+	int		i, block;
+	unsigned short	blocks = 0;
+
+	for (i = 0; i < ENCODING_LOOKUP_INDEX_SIZE; i++)
+		encoding_lookup_index[i] = 0;
+
+	/* Allocate a second stage block number to each block of code points
+	 * which contains mapped characters.
+	 */
+
+	for (i = 0; i < encoding_current_map_size; i++) {
+		if (encoding_current_map[i].utf8 < 0 || encoding_current_map[i].utf8 >= 0x110000)
+			continue;
+
+		block = encoding_current_map[i].utf8 / ENCODING_LOOKUP_BLOCK_SIZE;
+
+		if (encoding_lookup_index[block] == 0)
+			encoding_lookup_index[block] = ++blocks;
+	}
+
+	/* Claim and fill the second stage blocks, including the empty block zero. */
+
+	encoding_lookup_blocks = calloc(blocks + 1, ENCODING_LOOKUP_BLOCK_SIZE);
+	if (encoding_lookup_blocks == NULL) {
+		msg_report(MSG_ENC_NO_MEM);
+		return false;
+	}
+
+	for (i = 0; i < encoding_current_map_size; i++) {
+		if (encoding_current_map[i].utf8 < 0 || encoding_current_map[i].utf8 >= 0x110000)
+			continue;
+
+		block = encoding_lookup_index[encoding_current_map[i].utf8 / ENCODING_LOOKUP_BLOCK_SIZE];
+
+		encoding_lookup_blocks[block * ENCODING_LOOKUP_BLOCK_SIZE + encoding_current_map[i].utf8 % ENCODING_LOOKUP_BLOCK_SIZE] =
+				encoding_current_map[i].target;
+	}
+
 	return true;
 }
 
@@ -536,8 +618,21 @@ int encoding_get_utf8_string_length(char *text)
 {
 	int length = 0;
 
-	while (encoding_parse_utf8_string(&text) != 0)
+	if (text == NULL)
+		return 0;
+
+	/* ASCII characters are a byte each, so there's no need to decode
+	 * them; anything else is passed to the full UTF8 parser.
+	 */
+
+	while (*text != '\0') {
+		if (encoding_is_ascii((unsigned char) *text))
+			text++;
+		else if (encoding_parse_utf8_string(&text) == 0)
+			break;
+
 		length++;
+	}
 
 	return length;
 }
@@ -693,7 +788,7 @@ int encoding_write_utf8_character(char *buffer, size_t length, int unicode)
 
 static bool encoding_find_mapped_character(int unicode, char *c)
 {
-	int first = 0, last = encoding_current_map_size, middle;
+	unsigned char target;
 
 	if (c == NULL)
 		return false;
@@ -712,18 +807,15 @@ static bool encoding_find_mapped_character(int unicode, char *c)
 		return true;
 	}
 
-	/* Find the character in the current encoding. */
+	/* Look the character up in the current encoding. */
 
-	while (first <= last) {
-		middle = (first + last) / 2;
+	if (encoding_lookup_blocks != NULL && unicode >= 0 && unicode < 0x110000) {
+		target = encoding_lookup_blocks[encoding_lookup_index[unicode / ENCODING_LOOKUP_BLOCK_SIZE] *
+				ENCODING_LOOKUP_BLOCK_SIZE + unicode % ENCODING_LOOKUP_BLOCK_SIZE];
 
-		if (encoding_current_map[middle].utf8 == unicode) {
-			*c = encoding_current_map[middle].target;
+		if (target != 0) {
+			*c = target;
 			return true;
-		} else if (encoding_current_map[middle].utf8 < unicode) {
-			first = middle + 1;
-		} else {
-			last = middle - 1;
 		}
 	}
 
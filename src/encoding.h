@@ -39,6 +39,13 @@
 
 #define ENCODING_CHAR_BUF_LEN 5
 
+/**
+ * Test a Unicode character to see if it is plain ASCII, in which case
+ * it will be written out unchanged in all of the supported encodings.
+ */
+
+#define encoding_is_ascii(unicode) ((unicode) > 0 && (unicode) < 0x80)
+
 /* Useful Unicode Characters */
 
 /**
@@ -60,6 +60,14 @@ static struct search_tree *manual_entity_search_tree = NULL;
 
 static int manual_entities_max_entries = -1;
 
+/**
+ * The unicode code points of the entities, held in the same order as the
+ * entity definitions so that searches by code point only need to touch
+ * a compact array of integers.
+ */
+
+static int manual_entity_codepoints[MANUAL_ENTITY_NONE];
+
 /**
  * The list of known entity definitions.
  *
@@ -1726,14 +1734,14 @@ const char *manual_entity_find_name_from_codepoint(int codepoint)
 
 	/* Find the character in the current encoding. */
 
-	last = manual_entities_max_entries;
+	last = manual_entities_max_entries - 1;
 
 	while (first <= last) {
 		middle = (first + last) / 2;
 
-		if (manual_entity_names[middle].unicode == codepoint)
+		if (manual_entity_codepoints[middle] == codepoint)
 			return manual_entity_names[middle].name;
-		else if (manual_entity_names[middle].unicode < codepoint)
+		else if (manual_entity_codepoints[middle] < codepoint)
 			first = middle + 1;
 		else
 			last = middle - 1;
@@ -1793,6 +1801,7 @@ static bool manual_entity_initialise_lists(void)
 		}
 
 		current_code = manual_entity_names[i].unicode;
+		manual_entity_codepoints[i] = current_code;
 	}
 
 	manual_entities_max_entries = i;
@@ -120,6 +120,7 @@ enum msg_type {
 	MSG_ENC_NO_MAP,
 	MSG_ENC_BAD_UTF8,
 	MSG_ENC_NO_OUTPUT,
+	MSG_ENC_NO_MEM,
 	MSG_UNEXPECTED_BLOCK,
 	MSG_UNEXPECTED_CHUNK,
 	MSG_ENTITY_NO_MAP,
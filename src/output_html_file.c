@@ -95,7 +95,8 @@ void output_html_file_close(void)
 
 bool output_html_file_write_text(char *text)
 {
-	int c;
+	int	c;
+	size_t	length;
 
 	if (text == NULL)
 		return true;
@@ -106,6 +107,19 @@ bool output_html_file_write_text(char *text)
 	}
 
 	do {
+		/* Runs of ASCII are the same in all encodings, so write them in one go. */
+
+		for (length = 0; encoding_is_ascii((unsigned char) text[length]); length++);
+
+		if (length > 0) {
+			if (fwrite(text, 1, length, output_html_file_handle) != length) {
+				msg_report(MSG_WRITE_FAILED);
+				return false;
+			}
+
+			text += length;
+		}
+
 		c = encoding_parse_utf8_string(&text);
 
 		if (c != '\0' && !output_html_file_write_char(c))
@@ -188,22 +202,31 @@ bool output_html_file_write_newline(void)
 
 static bool output_html_file_write_char(int unicode)
 {
-	char buffer[ENCODING_CHAR_BUF_LEN], *entity;
+	char	buffer[ENCODING_CHAR_BUF_LEN], *entity;
+	int	result;
 
 	if (output_html_file_handle == NULL) {
 		msg_report(MSG_WRITE_NO_FILE);
 		return false;
 	}
 
-	if (!encoding_write_unicode_char(buffer, ENCODING_CHAR_BUF_LEN, unicode)) {
-		entity = (char *) manual_entity_find_name_from_codepoint(unicode);
-		if (entity != NULL)
-			return output_html_file_write_plain("&%s;", entity);
-		else
-			return output_html_file_write_plain("&#%d;", unicode);
+	/* ASCII doesn't need to go through the encoding tables. */
+
+	if (encoding_is_ascii(unicode)) {
+		result = fputc(unicode, output_html_file_handle);
+	} else {
+		if (!encoding_write_unicode_char(buffer, ENCODING_CHAR_BUF_LEN, unicode)) {
+			entity = (char *) manual_entity_find_name_from_codepoint(unicode);
+			if (entity != NULL)
+				return output_html_file_write_plain("&%s;", entity);
+			else
+				return output_html_file_write_plain("&#%d;", unicode);
+		}
+
+		result = fputs(buffer, output_html_file_handle);
 	}
 
-	if (fputs(buffer, output_html_file_handle) == EOF) {
+	if (result == EOF) {
 		msg_report(MSG_WRITE_FAILED);
 		return false;
 	}
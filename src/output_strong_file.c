@@ -745,7 +745,8 @@ static bool output_strong_file_write_catalogue(struct output_strong_file_object
 
 bool output_strong_file_write_text(char *text)
 {
-	int c;
+	int	c;
+	size_t	length;
 
 	if (text == NULL)
 		return true;
@@ -761,6 +762,21 @@ bool output_strong_file_write_text(char *text)
 	}
 
 	do {
+		/* Runs of ASCII are the same in all encodings, so write them in one
+		 * go up to the next character which needs escaping.
+		 */
+
+		for (length = 0; encoding_is_ascii((unsigned char) text[length]) && text[length] != '{'; length++);
+
+		if (length > 0) {
+			if (fwrite(text, 1, length, output_strong_file_handle) != length) {
+				msg_report(MSG_WRITE_FAILED);
+				return false;
+			}
+
+			text += length;
+		}
+
 		c = encoding_parse_utf8_string(&text);
 
 		if (c != '\0') {
@@ -861,6 +877,7 @@ bool output_strong_file_write_newline(void)
 static bool output_strong_file_write_char(int unicode)
 {
 	char	buffer[ENCODING_CHAR_BUF_LEN];
+	int	result;
 
 	if (output_strong_file_handle == NULL) {
 		msg_report(MSG_WRITE_NO_FILE);
@@ -872,9 +889,16 @@ static bool output_strong_file_write_char(int unicode)
 		return false;
 	}
 
-	encoding_write_unicode_char(buffer, ENCODING_CHAR_BUF_LEN, unicode);
+	/* ASCII doesn't need to go through the encoding tables. */
+
+	if (encoding_is_ascii(unicode)) {
+		result = fputc(unicode, output_strong_file_handle);
+	} else {
+		encoding_write_unicode_char(buffer, ENCODING_CHAR_BUF_LEN, unicode);
+		result = fputs(buffer, output_strong_file_handle);
+	}
 
-	if (fputs(buffer, output_strong_file_handle) == EOF) {
+	if (result == EOF) {
 		msg_report(MSG_WRITE_FAILED);
 		return false;
 	}
@@ -29,6 +29,7 @@
 
 #include <ctype.h>
 #include <stdbool.h>
+#include <stddef.h>
 #include <stdlib.h>
 #include <string.h>
 #include <stdio.h>
@@ -89,6 +90,12 @@ struct output_text_line_column {
 	 */
 	size_t					size;
 
+	/**
+	 * The length of the text in the column's buffer, excluding the
+	 * zero terminator.
+	 */
+	size_t					length;
+
 	/**
 	 * Pointer to the current position in the text during the
 	 * write-out operation, or NULL on completion.
@@ -144,6 +151,16 @@ struct output_text_line {
 	 */
 	struct output_text_line_column	*columns;
 
+	/**
+	 * The most recently found column in the line, or NULL.
+	 */
+	struct output_text_line_column	*found_column;
+
+	/**
+	 * The index of the most recently found column.
+	 */
+	int				found_index;
+
 	/**
 	 * The right-most column to have been written in the line.
 	*/
@@ -173,6 +190,13 @@ struct output_text_line {
 
 #define OUTPUT_TEXT_LINE_HYPHENATION_LIMIT 3
 
+/**
+ * The number of characters written at a time when outputting runs of
+ * padding or underlining.
+ */
+
+#define OUTPUT_TEXT_LINE_RUN_BLOCK_SIZE 64
+
 /* Global Variables. */
 
 /**
@@ -209,6 +233,7 @@ static bool output_text_line_write_column_underline(struct output_text_line_colu
 static bool output_text_line_pad_to_column(struct output_text_line_column *column);
 static bool output_text_line_pad_to_position(struct output_text_line *line, int position);
 static bool output_text_line_write_char(struct output_text_line *line, int c);
+static bool output_text_line_write_run(struct output_text_line *line, char c, int count);
 
 
 /**
@@ -389,6 +414,8 @@ static struct output_text_line *output_text_line_create(int page_width, int left
 	}
 
 	line->columns = NULL;
+	line->found_column = NULL;
+	line->found_index = 0;
 	line->page_width = page_width;
 	line->left_margin = left_margin;
 	line->next = NULL;
@@ -516,6 +543,7 @@ bool output_text_line_add_column(int margin, int width)
 	column->width = 0;
 	column->text = NULL;
 	column->size = 0;
+	column->length = 0;
 	column->write_ptr = NULL;
 	column->written_width = 0;
 	column->hanging_indent = 0;
@@ -580,6 +608,7 @@ bool output_text_line_reset(void)
 		if (column->text != NULL && column->size > 0)
 			column->text[0] = '\0';
 
+		column->length = 0;
 		column->written_width = 0;
 		column->blank_rows = 0;
 		column->hanging_indent = 0;
@@ -749,7 +778,7 @@ bool output_text_line_add_text(int column, char *text)
 
 static bool output_text_line_add_column_text(struct output_text_line_column *column, char *text)
 {
-	int	write_ptr;
+	size_t	length;
 
 	if (column == NULL) {
 		msg_report(MSG_TEXT_LINE_BAD_COL_REF);
@@ -761,43 +790,31 @@ static bool output_text_line_add_column_text(struct output_text_line_column *col
 	if (text == NULL)
 		return true;
 
-	/* Find the end of the text currently in the buffer. The buffer
-	 * should always be zero terminated, so if we get to the end
-	 * without a zero, there's a problem that we can't fix.
+	/* The end of the text currently in the buffer is tracked in the
+	 * column. The buffer should always be zero terminated there, so if
+	 * it isn't, there's a problem that we can't fix.
 	 */
 
-	if (column->text == NULL) {
+	if (column->text == NULL || column->length >= column->size || column->text[column->length] != '\0') {
 		msg_report(MSG_UNKNOWN_MEM_ERROR);
 		return false;
 	}
 
-	write_ptr = 0;
-
-	while ((column->text[write_ptr] != '\0') && (write_ptr < column->size))
-		write_ptr++;
-
-	if (column->text[write_ptr] != '\0') {
-		msg_report(MSG_UNKNOWN_MEM_ERROR);
-		return false;
-	}
-
-	/* The write_ptr is now pointing to the zero terminator, so
-	 * there is space to write the first character, at least.
+	/* Claim enough memory for the new text and its terminator in one go,
+	 * then copy it across.
 	 */
 
-	while (*text != '\0') {
-		column->text[write_ptr++] = *text++;
-
-		/* If we're now out of memory, try to claim some more. */
+	length = strlen(text);
 
-		if ((write_ptr >= column->size) && !output_text_line_update_column_memory(column)) {
-			column->text[write_ptr - 1] = '\0';
+	while (column->length + length >= column->size) {
+		if (!output_text_line_update_column_memory(column)) {
 			msg_report(MSG_TEXT_LINE_NO_MEM);
 			return false;
 		}
 	}
 
-	column->text[write_ptr] = '\0';
+	memcpy(column->text + column->length, text, length + 1);
+	column->length += length;
 
 	return true;
 }
@@ -811,7 +828,8 @@ static bool output_text_line_add_column_text(struct output_text_line_column *col
 
 static bool output_text_line_update_column_memory(struct output_text_line_column *column)
 {
-	char *new;
+	char		*new;
+	ptrdiff_t	write_offset;
 
 	if (column == NULL) {
 		msg_report(MSG_TEXT_LINE_BAD_COL_REF);
@@ -830,11 +848,19 @@ static bool output_text_line_update_column_memory(struct output_text_line_column
 		if (column->size > 0)
 			column->text[0] = '\0';
 	} else {
+		write_offset = (column->write_ptr != NULL) ? column->write_ptr - column->text : -1;
+
 		new = realloc(column->text, column->size + OUTPUT_TEXT_LINE_COLUMN_BLOCK_SIZE);
 		if (new == NULL)
 			return false;
 
+		/* The block may have moved, so update the pointers into it. */
+
+		column->text = new;
 		column->size += OUTPUT_TEXT_LINE_COLUMN_BLOCK_SIZE;
+
+		if (write_offset >= 0)
+			column->write_ptr = column->text + write_offset;
 	}
 
 	return true;
@@ -943,6 +969,7 @@ static bool output_text_line_set_column_hanging_indent(struct output_text_line_c
 static struct output_text_line_column* output_text_line_find_column(struct output_text_line *line, int column)
 {
 	struct output_text_line_column	*col = NULL;
+	int				index;
 
 	if (line == NULL) {
 		msg_report(MSG_TEXT_LINE_BAD_REF);
@@ -954,12 +981,28 @@ static struct output_text_line_column* output_text_line_find_column(struct outpu
 	if (column < 0)
 		return NULL;
 
-	/* Scan for the column index. */
+	/* Scan for the column index. Columns are only ever added to the end
+	 * of the list, so if the column is at or beyond the previous one
+	 * found, the scan can start from there.
+	 */
 
-	col = line->columns;
+	if (line->found_column != NULL && column >= line->found_index) {
+		col = line->found_column;
+		index = line->found_index;
+	} else {
+		col = line->columns;
+		index = 0;
+	}
 
-	while (col != NULL && column-- > 0)
+	while (col != NULL && index < column) {
 		col = col->next;
+		index++;
+	}
+
+	if (col != NULL) {
+		line->found_column = col;
+		line->found_index = index;
+	}
 
 	return col;
 }
@@ -1287,8 +1330,6 @@ static bool output_text_line_write_column(struct output_text_line_column *column
 
 static bool output_text_line_write_column_underline(struct output_text_line_column *column)
 {
-	int i;
-
 	if (column == NULL) {
 		msg_report(MSG_TEXT_LINE_BAD_COL_REF);
 		return false;
@@ -1304,12 +1345,7 @@ static bool output_text_line_write_column_underline(struct output_text_line_colu
 	if (!output_text_line_pad_to_column(column))
 		return false;
 
-	for (i = 0; i < column->written_width; i++) {
-		if (!output_text_line_write_char(column->parent, '-'))
-			return false;
-	}
-
-	return true;
+	return output_text_line_write_run(column->parent, '-', column->written_width);
 }
 
 /**
@@ -1343,12 +1379,10 @@ static bool output_text_line_pad_to_position(struct output_text_line *line, int
 		return false;
 	}
 
-	while (line->position < position) {
-		if (!output_text_line_write_char(line, ' '))
-			return false;
-	}
+	if (line->position >= position)
+		return true;
 
-	return true;
+	return output_text_line_write_run(line, ' ', position - line->position);
 }
 
 /**
@@ -1435,7 +1469,8 @@ bool output_text_line_write_newline(void)
 
 static bool output_text_line_write_char(struct output_text_line *line, int unicode)
 {
-	char buffer[ENCODING_CHAR_BUF_LEN];
+	char	buffer[ENCODING_CHAR_BUF_LEN];
+	int	result;
 
 	if (line == NULL) {
 		msg_report(MSG_TEXT_LINE_BAD_REF);
@@ -1447,9 +1482,16 @@ static bool output_text_line_write_char(struct output_text_line *line, int unico
 		return false;
 	}
 
-	encoding_write_unicode_char(buffer, ENCODING_CHAR_BUF_LEN, unicode);
+	/* ASCII doesn't need to go through the encoding tables. */
 
-	if (fputs(buffer, output_text_line_handle) == EOF) {
+	if (encoding_is_ascii(unicode)) {
+		result = fputc(unicode, output_text_line_handle);
+	} else {
+		encoding_write_unicode_char(buffer, ENCODING_CHAR_BUF_LEN, unicode);
+		result = fputs(buffer, output_text_line_handle);
+	}
+
+	if (result == EOF) {
 		msg_report(MSG_WRITE_FAILED);
 		return false;
 	}
@@ -1459,3 +1501,45 @@ static bool output_text_line_write_char(struct output_text_line *line, int unico
 	return true;
 }
 
+/**
+ * Write a run of identical ASCII characters to the output, in blocks
+ * rather than one character at a time.
+ *
+ * \param *line		The line instance to work with.
+ * \param c		The ASCII character to be written.
+ * \param count		The number of characters to write.
+ * \return		True if successful; False on error.
+ */
+
+static bool output_text_line_write_run(struct output_text_line *line, char c, int count)
+{
+	char	buffer[OUTPUT_TEXT_LINE_RUN_BLOCK_SIZE];
+	size_t	block;
+
+	if (line == NULL) {
+		msg_report(MSG_TEXT_LINE_BAD_REF);
+		return false;
+	}
+
+	if (output_text_line_handle == NULL) {
+		msg_report(MSG_WRITE_NO_FILE);
+		return false;
+	}
+
+	memset(buffer, c, OUTPUT_TEXT_LINE_RUN_BLOCK_SIZE);
+
+	while (count > 0) {
+		block = (count < OUTPUT_TEXT_LINE_RUN_BLOCK_SIZE) ? count : OUTPUT_TEXT_LINE_RUN_BLOCK_SIZE;
+
+		if (fwrite(buffer, 1, block, output_text_line_handle) != block) {
+			msg_report(MSG_WRITE_FAILED);
+			return false;
+		}
+
+		line->position += block;
+		count -= block;
+	}
+
+	return true;
+}
+
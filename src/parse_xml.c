@@ -27,7 +27,6 @@
  * XML Chunk Parser, implementation.
  */
 
-#include <ctype.h>
 #include <stdbool.h>
 #include <stdio.h>
 #include <stdlib.h>
@@ -74,9 +73,19 @@ struct parse_xml_attribute {
 
 struct parse_xml_block {
 	/**
-	 * The handle of the file, or NULL.
+	 * The contents of the file, or NULL.
 	 */
-	FILE *file;
+	char *data;
+
+	/**
+	 * The length of the file contents, in bytes.
+	 */
+	long data_length;
+
+	/**
+	 * The current read position within the file contents.
+	 */
+	long data_pointer;
 
 	/**
 	 * The current parser mode.
@@ -133,6 +142,7 @@ struct parse_xml_block {
 /* Static Function Prototypes. */
 
 static struct parse_xml_block *parse_xml_initialise(void);
+static char *parse_xml_load_file(char *filename, long *length);
 static struct parse_xml_attribute *parse_xml_find_attribute(struct parse_xml_block *instance, const char *name);
 static size_t parse_xml_copy_text_to_buffer(struct parse_xml_block *instance, long start, size_t length, char *buffer, size_t size);
 static void parse_xml_read_text(struct parse_xml_block *instance, int c);
@@ -143,12 +153,47 @@ static void parse_xml_read_element_attributes(struct parse_xml_block *instance,
 static void parse_xml_read_entity(struct parse_xml_block *instance, int c);
 static bool parse_xml_match_ahead(struct parse_xml_block *instance, const char *text);
 static int parse_xml_getc(struct parse_xml_block *instance);
+static void parse_xml_update_line_count(struct parse_xml_block *instance, long fp);
+
+/**
+ * Character class flags, used in the parse_xml_char_class table.
+ */
+
+#define PARSE_XML_CHAR_SPACE 0x01
+#define PARSE_XML_CHAR_NAME_START 0x02
+#define PARSE_XML_CHAR_NAME 0x04
+
+/**
+ * The classes of each of the possible byte values in the file, so that the
+ * type tests can be done with a single lookup. Name start characters are also
+ * valid as name characters.
+ */
+
+static const unsigned char parse_xml_char_class[256] = {
+	0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 1, 0, 0,	/* 0x00 */
+	0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,	/* 0x10 */
+	1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 4, 4, 0,	/* 0x20 */
+	4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 6, 0, 0, 0, 0, 0,	/* 0x30 */
+	0, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,	/* 0x40 */
+	6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 0, 0, 0, 0, 6,	/* 0x50 */
+	0, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,	/* 0x60 */
+	6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 0, 0, 0, 0, 0,	/* 0x70 */
+	0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,	/* 0x80 */
+	0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,	/* 0x90 */
+	0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,	/* 0xa0 */
+	0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,	/* 0xb0 */
+	0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,	/* 0xc0 */
+	0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,	/* 0xd0 */
+	0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,	/* 0xe0 */
+	0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0	/* 0xf0 */
+};
 
 /* Type tests. */
 
-#define parse_xml_isspace(x) ((x) == '\t' || (x) == '\n' || (x) == '\r' || (x) == ' ')
-#define parse_xml_isname_start(x) ((x) == ':' || (x) == '_' || ((x) >= 'A' && (x) <= 'Z') || ((x) >= 'a' && (x) <= 'z'))
-#define parse_xml_isname(x) (parse_xml_isname_start(x) || (x) == '-' || (x) == '.' || ((x) >= '0' && (x) <= '9'))
+#define parse_xml_ischar_class(x, c) ((x) >= 0 && (x) <= 0xff && (parse_xml_char_class[(x)] & (c)))
+#define parse_xml_isspace(x) parse_xml_ischar_class((x), PARSE_XML_CHAR_SPACE)
+#define parse_xml_isname_start(x) parse_xml_ischar_class((x), PARSE_XML_CHAR_NAME_START)
+#define parse_xml_isname(x) parse_xml_ischar_class((x), PARSE_XML_CHAR_NAME)
 
 /**
  * Initialise the file parser for use.
@@ -173,11 +218,64 @@ static struct parse_xml_block *parse_xml_initialise(void)
 	new->text_block_length = 0;
 
 	new->attribute_count = 0;
-	new->file = NULL;
+	new->data = NULL;
+	new->data_length = 0;
+	new->data_pointer = 0;
 
 	return new;
 }
 
+/**
+ * Load the contents of a file into memory in a single read, so that the
+ * parser can work on it without the overhead of stream calls for every
+ * character.
+ *
+ * \param *filename	The name of the file to load.
+ * \param *length	Pointer to a variable to take the file length.
+ * \return		Pointer to the file contents, or NULL on failure.
+ */
+
+static char *parse_xml_load_file(char *filename, long *length)
+{
+	FILE *file;
+	char *data = NULL;
+	long size;
+
+	if (filename == NULL || length == NULL)
+		return NULL;
+
+	file = fopen(filename, "rb");
+	if (file == NULL)
+		return NULL;
+
+	/* Find the size of the file. */
+
+	if (fseek(file, 0, SEEK_END) != 0 || (size = ftell(file)) < 0 || fseek(file, 0, SEEK_SET) != 0) {
+		fclose(file);
+		return NULL;
+	}
+
+	/* Claim a buffer and read the file in to it. */
+
+	data = malloc((size > 0) ? size : 1);
+	if (data == NULL) {
+		fclose(file);
+		return NULL;
+	}
+
+	if (size > 0 && fread(data, 1, size, file) != (size_t) size) {
+		free(data);
+		fclose(file);
+		return NULL;
+	}
+
+	fclose(file);
+
+	*length = size;
+
+	return data;
+}
+
 /**
  * Open a new file in the XML parser.
  *
@@ -196,10 +294,10 @@ struct parse_xml_block *parse_xml_open_file(char *filename)
 	if (instance == NULL)
 		return NULL;
 
-	/* Open the file. */
+	/* Load the file into memory. */
 
-	instance->file = fopen(filename, "rb");
-	if (instance->file == NULL) {
+	instance->data = parse_xml_load_file(filename, &(instance->data_length));
+	if (instance->data == NULL) {
 		free(instance);
 		return NULL;
 	}
@@ -211,7 +309,8 @@ struct parse_xml_block *parse_xml_open_file(char *filename)
 	for (i = 0; i < PARSE_XML_MAX_ATTRIBUTES; i++) {
 		parser = parse_xml_initialise();
 		if (parser != NULL) {
-			parser->file = instance->file;
+			parser->data = instance->data;
+			parser->data_length = instance->data_length;
 		}
 		instance->attributes[i].parser = parser;
 	}
@@ -236,10 +335,10 @@ void parse_xml_close_file(struct parse_xml_block *instance)
 	if (instance == NULL)
 		return;
 	
-	/* Close the file. */
+	/* Free the file contents, which are shared with the attribute parsers. */
 
-	if (instance->file != NULL)
-		fclose(instance->file);
+	if (instance->data != NULL)
+		free(instance->data);
 
 	/* Free the attribute parser instances. */
 
@@ -291,13 +390,10 @@ enum parse_xml_result parse_xml_read_next_chunk(struct parse_xml_block *instance
 
 	/* Exit on error or EOF. */
 
-	if (instance->file == NULL)
+	if (instance->data == NULL)
 		return PARSE_XML_RESULT_ERROR;
 
-	fseek(instance->file, instance->file_pointer, SEEK_SET);
-
-	if (feof(instance->file))
-		return PARSE_XML_RESULT_EOF;
+	instance->data_pointer = instance->file_pointer;
 
 	/* Decide what to do based on the next character in the file. */
 
@@ -321,7 +417,7 @@ enum parse_xml_result parse_xml_read_next_chunk(struct parse_xml_block *instance
 		}
 	}
 
-	instance->file_pointer = ftell(instance->file);
+	instance->file_pointer = instance->data_pointer;
 
 	return instance->current_mode;
 }
@@ -339,7 +435,7 @@ char *parse_xml_get_text(struct parse_xml_block *instance)
 {
 	char *text;
 
-	if (instance == NULL || instance->file == NULL)
+	if (instance == NULL || instance->data == NULL)
 		return NULL;
 
 	if (instance->current_mode != PARSE_XML_RESULT_TEXT &&
@@ -375,7 +471,7 @@ size_t parse_xml_copy_text(struct parse_xml_block *instance, char *buffer, size_
 
 	buffer[0] = '\0';
 
-	if (instance == NULL || instance->file == NULL)
+	if (instance == NULL || instance->data == NULL)
 		return 0;
 
 	if (instance->current_mode != PARSE_XML_RESULT_TEXT &&
@@ -442,7 +538,7 @@ char *parse_xml_get_attribute_text(struct parse_xml_block *instance, const char
 	struct parse_xml_attribute *attribute;
 	char *text;
 
-	if (instance == NULL || instance->file == NULL)
+	if (instance == NULL || instance->data == NULL)
 		return NULL;
 
 	attribute = parse_xml_find_attribute(instance, name);
@@ -483,7 +579,7 @@ size_t parse_xml_copy_attribute_text(struct parse_xml_block *instance, const cha
 
 	buffer[0] = '\0';
 
-	if (instance == NULL || instance->file == NULL)
+	if (instance == NULL || instance->data == NULL)
 		return 0;
 
 	attribute = parse_xml_find_attribute(instance, name);
@@ -510,7 +606,7 @@ bool parse_xml_test_boolean_attribute(struct parse_xml_block *instance, const ch
 	struct parse_xml_attribute *attribute;
 	char buffer[PARSE_XML_MAX_ATTRIBUTE_VAL_LEN];
 
-	if (instance == NULL || instance->file == NULL) {
+	if (instance == NULL || instance->data == NULL) {
 		if (instance != NULL)
 			instance->current_mode = PARSE_XML_RESULT_ERROR;
 		return false;
@@ -555,7 +651,7 @@ int parse_xml_read_integer_attribute(struct parse_xml_block *instance, const cha
 	struct parse_xml_attribute *attribute;
 	char buffer[PARSE_XML_MAX_ATTRIBUTE_VAL_LEN];
 
-	if (instance == NULL || instance->file == NULL) {
+	if (instance == NULL || instance->data == NULL) {
 		if (instance != NULL)
 			instance->current_mode = PARSE_XML_RESULT_ERROR;
 		return deflt;
@@ -608,7 +704,7 @@ int parse_xml_read_option_attribute(struct parse_xml_block *instance, const char
 	struct parse_xml_attribute *attribute;
 	char buffer[PARSE_XML_MAX_ATTRIBUTE_VAL_LEN], *pattern;
 
-	if (instance == NULL || instance->file == NULL) {
+	if (instance == NULL || instance->data == NULL) {
 		if (instance != NULL)
 			instance->current_mode = PARSE_XML_RESULT_ERROR;
 		return -1;
@@ -719,7 +815,7 @@ static size_t parse_xml_copy_text_to_buffer(struct parse_xml_block *instance, lo
 
 	/* Find the start of the text to copy. */
 
-	fseek(instance->file, start, SEEK_SET);
+	instance->data_pointer = start;
 
 	/* Copy the text from the file to the buffer, converting \r and \r\n into \n. */
 
@@ -746,7 +842,7 @@ static size_t parse_xml_copy_text_to_buffer(struct parse_xml_block *instance, lo
 
 	/* Restore the file pointer to where it came from. */
 
-	fseek(instance->file, instance->file_pointer, SEEK_SET);
+	instance->data_pointer = instance->file_pointer;
 
 	return j;
 }
@@ -762,30 +858,35 @@ static size_t parse_xml_copy_text_to_buffer(struct parse_xml_block *instance, lo
 static void parse_xml_read_text(struct parse_xml_block *instance, int c)
 {
 	bool whitespace = true;
+	long fp;
 
-	if (instance == NULL || instance->file == NULL) {
+	if (instance == NULL || instance->data == NULL) {
 		if (instance != NULL)
 			instance->current_mode = PARSE_XML_RESULT_ERROR;
 		return;
 	}
 
-	/* Count the size of the text block. */
+	/* Count the size of the text block. The first character has already
+	 * been read, so scan the data directly from there to the next markup,
+	 * leaving the file pointer on the character which ended the block.
+	 */
+
+	instance->text_block_start = instance->data_pointer - 1;
 
-	instance->text_block_start = ftell(instance->file) - 1;
-	instance->text_block_length = 0;
+	for (fp = instance->text_block_start; fp < instance->data_length; fp++) {
+		c = (unsigned char) instance->data[fp];
+
+		if (c == instance->eof || c == '<' || c == '&')
+			break;
 
-	while (c != instance->eof && c != '<' && c != '&') {
-		instance->text_block_length++;
 		if (!parse_xml_isspace(c))
 			whitespace = false;
-
-		c = parse_xml_getc(instance);
+		else if (c == '\n')
+			parse_xml_update_line_count(instance, fp + 1);
 	}
 
-	/* Return the last character to the file. */
-
-	if (c != EOF)
-		fseek(instance->file, -1, SEEK_CUR);
+	instance->text_block_length = fp - instance->text_block_start;
+	instance->data_pointer = fp;
 
 	/* Update the status. */
 
@@ -810,7 +911,7 @@ static void parse_xml_read_markup(struct parse_xml_block *instance, int c)
 {
 	/* Tags must start with a <; we shouldn't be here otherwise. */
 
-	if (c != '<' || instance == NULL || instance->file == NULL) {
+	if (c != '<' || instance == NULL || instance->data == NULL) {
 		if (instance != NULL)
 			instance->current_mode = PARSE_XML_RESULT_ERROR;
 		return;
@@ -852,7 +953,7 @@ static void parse_xml_read_element(struct parse_xml_block *instance, int c)
 {
 	int len = 0;
 
-	if (instance == NULL || instance->file == NULL) {
+	if (instance == NULL || instance->data == NULL) {
 		if (instance != NULL)
 			instance->current_mode = PARSE_XML_RESULT_ERROR;
 		return;
@@ -922,7 +1023,7 @@ static void parse_xml_read_element(struct parse_xml_block *instance, int c)
 
 	/* If the tag ended with a /, it was a self-closing tag. */
 
-	fseek(instance->file, -2, SEEK_CUR);
+	instance->data_pointer -= 2;
 	c = parse_xml_getc(instance);
 
 	if (c == '/') {
@@ -975,7 +1076,7 @@ static void parse_xml_read_element_attributes(struct parse_xml_block *instance,
 	long start = -1, length = 0;
 	char name[PARSE_XML_MAX_NAME_LEN], quote = '\0';
 
-	if (instance == NULL || instance->file == NULL) {
+	if (instance == NULL || instance->data == NULL) {
 		if (instance != NULL)
 			instance->current_mode = PARSE_XML_RESULT_ERROR;
 		return;
@@ -1021,7 +1122,7 @@ static void parse_xml_read_element_attributes(struct parse_xml_block *instance,
 
 		/* Skip any whitespace after the name. */
 
-		while (c != instance->eof && isspace(c))
+		while (c != instance->eof && parse_xml_isspace(c))
 			c = parse_xml_getc(instance);
 
 		/* There's a value with the attribute. */
@@ -1031,14 +1132,14 @@ static void parse_xml_read_element_attributes(struct parse_xml_block *instance,
 
 			/* Skip any whitespace after the = sign. */
 
-			while (c != instance->eof && isspace(c))
+			while (c != instance->eof && parse_xml_isspace(c))
 				c = parse_xml_getc(instance);
 
 			/* What follows must be quoted in " or '. */
 
 			if (c == '\'' || c == '"') {
 				quote = c;
-				start = ftell(instance->file);
+				start = instance->data_pointer;
 
 				/* Step through the data, and find the length. */
 
@@ -1047,7 +1148,7 @@ static void parse_xml_read_element_attributes(struct parse_xml_block *instance,
 				while (c != instance->eof && c != quote)
 					c = parse_xml_getc(instance);
 
-				length = ftell(instance->file) - (start + 1);
+				length = instance->data_pointer - (start + 1);
 
 				if (c != quote) {
 					instance->current_mode = PARSE_XML_RESULT_ERROR;
@@ -1093,7 +1194,7 @@ static void parse_xml_read_comment(struct parse_xml_block *instance)
 {
 	int c, dashes = 0;
 
-	if (instance == NULL || instance->file == NULL) {
+	if (instance == NULL || instance->data == NULL) {
 		if (instance != NULL)
 			instance->current_mode = PARSE_XML_RESULT_ERROR;
 		return;
@@ -1135,7 +1236,7 @@ static void parse_xml_read_entity(struct parse_xml_block *instance, int c)
 
 	/* Entities must start with &; we shouldn't be here otherwise! */
 
-	if (c != '&' || instance == NULL || instance->file == NULL) {
+	if (c != '&' || instance == NULL || instance->data == NULL) {
 		if (instance != NULL)
 			instance->current_mode = PARSE_XML_RESULT_ERROR;
 		return;
@@ -1200,12 +1301,12 @@ static bool parse_xml_match_ahead(struct parse_xml_block *instance, const char *
 	int c;
 	long start;
 
-	if (text == NULL || instance == NULL || instance->file == NULL)
+	if (text == NULL || instance == NULL || instance->data == NULL)
 		return false;
 
 	/* Remember where we started. */
 
-	start = ftell(instance->file);
+	start = instance->data_pointer;
 
 	/* Match through the required string. */
 
@@ -1221,7 +1322,7 @@ static bool parse_xml_match_ahead(struct parse_xml_block *instance, const char *
 	/* If there wasn't a match, reset the file pointer. */
 
 	if (*text != '\0')
-		fseek(instance->file, start, SEEK_SET);
+		instance->data_pointer = start;
 
 	return (*text == '\0') ? true : false;
 }
@@ -1237,21 +1338,35 @@ static bool parse_xml_match_ahead(struct parse_xml_block *instance, const char *
 static int parse_xml_getc(struct parse_xml_block *instance)
 {
 	int c;
-	long fp;
 
-	if (instance == NULL || instance->file == NULL)
+	if (instance == NULL || instance->data == NULL)
 		return instance->eof;
 
-	c = fgetc(instance->file);
+	if (instance->data_pointer < 0 || instance->data_pointer >= instance->data_length)
+		return EOF;
+
+	c = (unsigned char) instance->data[instance->data_pointer++];
+
+	if (c == '\n')
+		parse_xml_update_line_count(instance, instance->data_pointer);
+
+	return c;
+}
 
-	fp = ftell(instance->file);
+/**
+ * Update the line count after a newline has been read from the file,
+ * unless the newline has already been counted.
+ *
+ * \param *instance	The parser instance to use.
+ * \param fp		The file pointer following the newline.
+ */
 
-	if (c == '\n' && fp > instance->line_count_file_pointer) {
+static void parse_xml_update_line_count(struct parse_xml_block *instance, long fp)
+{
+	if (fp > instance->line_count_file_pointer) {
 		msg_set_line(++(instance->line_count));
 		instance->line_count_file_pointer = fp;
 	}
-
-	return c;
 }
 
 /**
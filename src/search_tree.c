@@ -43,6 +43,12 @@
 
 #define SEARCH_TREE_BIN_COUNT 27
 
+/**
+ * The number of nodes to claim from the heap at a time.
+ */
+
+#define SEARCH_TREE_NODE_BLOCK_SIZE 256
+
 /* Static function prototypes. */
 
 static struct search_tree *search_tree_create_new_node(char c);
@@ -75,6 +81,18 @@ struct search_tree {
 	void *data;
 };
 
+/**
+ * The block of memory from which new nodes are currently being taken.
+ */
+
+static struct search_tree *search_tree_node_block = NULL;
+
+/**
+ * The number of unused nodes remaining in the current block.
+ */
+
+static int search_tree_node_block_free = 0;
+
 /**
  * Create a new search tree root node.
  *
@@ -221,12 +239,24 @@ static struct search_tree *search_tree_create_new_node(char c)
 	struct search_tree *new;
 	int i;
 
-	new = malloc(sizeof(struct search_tree));
-	if (new == NULL) {
-		msg_report(MSG_TREE_MALLOC_FAIL);
-		return NULL;
+	/* Search trees are never freed, so rather than claiming each node
+	 * individually, take them from larger blocks of memory.
+	 */
+
+	if (search_tree_node_block == NULL || search_tree_node_block_free <= 0) {
+		search_tree_node_block = malloc(sizeof(struct search_tree) * SEARCH_TREE_NODE_BLOCK_SIZE);
+		if (search_tree_node_block == NULL) {
+			search_tree_node_block_free = 0;
+			msg_report(MSG_TREE_MALLOC_FAIL);
+			return NULL;
+		}
+
+		search_tree_node_block_free = SEARCH_TREE_NODE_BLOCK_SIZE;
 	}
 
+	new = search_tree_node_block++;
+	search_tree_node_block_free--;
+
 	new->c = c;
 
 	for (i = 0; i < SEARCH_TREE_BIN_COUNT; i++)